@@ -4,8 +4,8 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import time
-from collections.abc import MutableMapping
-from typing import Literal, Required, TypedDict
+from collections.abc import Callable, Mapping, MutableMapping
+from typing import Literal, NotRequired, Required, TypedDict
 
 from cmk.agent_based.v2 import (
     check_levels,
@@ -25,10 +25,12 @@ from cmk.agent_based.v2 import (
 from cmk.plugins.lib.temperature import check_temperature
 
 from .smart import DiscoveryParam, get_item, TempAndDiscoveredParams
-from .smart_posix import ATAAll, ATADevice, Section
+from .smart_posix import ATAAll, ATADevice, ATATableEntry, Section
 
 MAX_COMMAND_TIMEOUTS_PER_HOUR = 100
 
+DISCOVERED_IDS = (5, 10, 184, 187, 188, 196, 197, 199)
+
 
 def discovery_smart_ata_temp(
     params: DiscoveryParam,
@@ -94,6 +96,8 @@ class AtaDiscoveredParams(TypedDict):
     id_196: Required[int | None]
     id_197: Required[int | None]
     id_199: Required[int | None]
+    # raw values of DISCOVERED_IDS, in that order
+    discovered: NotRequired[tuple[int | None, ...]]
 
 
 class AtaRuleSetParams(TypedDict):
@@ -132,16 +136,23 @@ def discover_smart_ata(
     }
     for key, disk in devices.items():
         if isinstance(disk.device, ATADevice) and disk.ata_smart_attributes is not None:
+            attrs = disk.attributes_by_id()
+            discovered = tuple(
+                entry.raw.value if (entry := attrs.get(id_)) is not None else None
+                for id_ in DISCOVERED_IDS
+            )
+            id_5, id_10, id_184, id_187, id_188, id_196, id_197, id_199 = discovered
             parameters: AtaDiscoveredParams = {
                 "key": key,
-                "id_5": entry.raw.value if (entry := disk.by_id(5)) is not None else None,
-                "id_10": entry.raw.value if (entry := disk.by_id(10)) is not None else None,
-                "id_184": entry.raw.value if (entry := disk.by_id(184)) is not None else None,
-                "id_187": entry.raw.value if (entry := disk.by_id(187)) is not None else None,
-                "id_188": entry.raw.value if (entry := disk.by_id(188)) is not None else None,
-                "id_196": entry.raw.value if (entry := disk.by_id(196)) is not None else None,
-                "id_197": entry.raw.value if (entry := disk.by_id(197)) is not None else None,
-                "id_199": entry.raw.value if (entry := disk.by_id(199)) is not None else None,
+                "id_5": id_5,
+                "id_10": id_10,
+                "id_184": id_184,
+                "id_187": id_187,
+                "id_188": id_188,
+                "id_196": id_196,
+                "id_197": id_197,
+                "id_199": id_199,
+                "discovered": discovered,
             }
             yield Service(
                 item=get_item(disk, params["item_type"][0]),
@@ -160,8 +171,8 @@ def check_smart_ata(
         params,
         section_smart_posix_all,
         section_smart_posix_scan_arg,
-        get_value_store(),
-        time.time(),
+        get_value_store,
+        time.time,
     )
 
 
@@ -170,8 +181,8 @@ def _check_smart_ata(
     params: AtaParams,
     section_smart_posix_all: Section | None,
     section_smart_posix_scan_arg: Section | None,
-    value_store: MutableMapping[str, object],
-    now: float,
+    value_store_factory: Callable[[], MutableMapping[str, object]],
+    now_factory: Callable[[], float],
 ) -> CheckResult:
     devices = {
         **(section_smart_posix_scan_arg.devices if section_smart_posix_scan_arg else {}),
@@ -180,16 +191,31 @@ def _check_smart_ata(
     if not isinstance(disk := devices.get(params["key"]), ATAAll):
         return
 
-    if (reallocated_sector_count := disk.by_id(5)) is not None:
+    attrs = disk.attributes_by_id()
+    if (discovered := params.get("discovered")) is None:
+        # Services discovered before "discovered" was introduced only have the id_* keys.
+        discovered = (
+            params.get("id_5"),
+            params.get("id_10"),
+            params.get("id_184"),
+            params.get("id_187"),
+            params.get("id_188"),
+            params.get("id_196"),
+            params.get("id_197"),
+            params.get("id_199"),
+        )
+    d5, d10, d184, d187, _d188, d196, d197, d199 = discovered
+
+    if (reallocated_sector_count := attrs.get(5)) is not None:
         yield from _check_against_params(
             param=params["levels_5"],
             value=reallocated_sector_count.raw.value,
-            discovered_value=params.get("id_5"),
+            discovered_value=d5,
             label="Reallocated sectors",
             metric_name="harddrive_reallocated_sectors",
         )
 
-    if (power_on_hours := disk.by_id(9)) is not None:
+    if (power_on_hours := attrs.get(9)) is not None:
         yield from check_levels(
             value=power_on_hours.raw.value,
             label="Powered on",
@@ -197,16 +223,16 @@ def _check_smart_ata(
             metric_name="uptime",
         )
 
-    if (spin_retries := disk.by_id(10)) is not None:
+    if (spin_retries := attrs.get(10)) is not None:
         yield from _check_against_params(
             param=params["levels_10"],
             value=spin_retries.raw.value,
-            discovered_value=params.get("id_10"),
+            discovered_value=d10,
             label="Spin retries",
             metric_name="harddrive_spin_retries",
         )
 
-    if (power_cycles := disk.by_id(12)) is not None:
+    if (power_cycles := attrs.get(12)) is not None:
         yield from check_levels(
             value=power_cycles.raw.value,
             label="Power cycles",
@@ -214,31 +240,31 @@ def _check_smart_ata(
             render_func=str,
         )
 
-    if (end_to_end_errors := disk.by_id(184)) is not None:
+    if (end_to_end_errors := attrs.get(184)) is not None:
         yield from _check_against_params(
             param=params["levels_184"],
             value=end_to_end_errors.raw.value,
-            discovered_value=params.get("id_184"),
+            discovered_value=d184,
             label="End-to-End Errors",
             metric_name="harddrive_end_to_end_errors",
         )
 
-    if (uncorrectable_errors := disk.by_id(187)) is not None:
+    if (uncorrectable_errors := attrs.get(187)) is not None:
         yield from _check_against_params(
             param=params["levels_187"],
             value=uncorrectable_errors.raw.value,
-            discovered_value=params.get("id_187"),
+            discovered_value=d187,
             label="Uncorrectable errors",
             metric_name="harddrive_uncorrectable_errors",
         )
 
-    yield from _check_command_timeout(disk, value_store, now)
+    yield from _check_command_timeout(attrs, value_store_factory, now_factory)
 
-    if (reallocated_events := disk.by_id(196)) is not None:
+    if (reallocated_events := attrs.get(196)) is not None:
         yield from _check_against_params(
             param=params["levels_196"],
             value=reallocated_events.raw.value,
-            discovered_value=params.get("id_196"),
+            discovered_value=d196,
             label="Reallocated events",
             metric_name="harddrive_reallocated_events",
         )
@@ -248,21 +274,21 @@ def _check_smart_ata(
             label="Normalized value",
         )
 
-    if (pending_sectors := disk.by_id(197)) is not None:
+    if (pending_sectors := attrs.get(197)) is not None:
         yield from _check_against_params(
             param=params["levels_197"],
             value=pending_sectors.raw.value,
-            discovered_value=params.get("id_197"),
+            discovered_value=d197,
             label="Pending sectors",
             metric_name="harddrive_pending_sectors",
         )
 
-    if (crc_errors := disk.by_id(199)) is not None:
+    if (crc_errors := attrs.get(199)) is not None:
         if crc_errors.name == "UDMA_CRC_Error_Count":
             yield from _check_against_params(
                 param=params["levels_199"],
                 value=crc_errors.raw.value,
-                discovered_value=params.get("id_199"),
+                discovered_value=d199,
                 label="UDMA CRC errors",
                 metric_name="harddrive_udma_crc_errors",
             )
@@ -270,7 +296,7 @@ def _check_smart_ata(
             yield from _check_against_params(
                 param=params["levels_199"],
                 value=crc_errors.raw.value,
-                discovered_value=params.get("id_199"),
+                discovered_value=d199,
                 label="CRC errors",
                 metric_name="harddrive_crc_errors",
             )
@@ -295,24 +321,27 @@ def _check_against_params(
 def _check_against_discovery(
     value: int, discovered_value: int | None, label: str, metric_name: str
 ) -> CheckResult:
-    if discovered_value is not None and value > discovered_value:
-        yield Result(
-            state=State.CRIT,
-            summary=f"{label}: {value} (during discovery: {discovered_value}) (!!)",
-        )
-    else:
-        yield Result(
-            state=State.OK,
-            summary=f"{label}: {value}",
-        )
+    over = discovered_value is not None and value > discovered_value
+    suffix = f" (during discovery: {discovered_value}) (!!)" if over else ""
+    yield Result(
+        state=State.CRIT if over else State.OK,
+        summary=f"{label}: {value}{suffix}",
+    )
     yield Metric(metric_name, value)
 
 
 def _check_command_timeout(
-    disk: ATAAll, value_store: MutableMapping[str, object], now: float
+    attrs: Mapping[int, ATATableEntry],
+    value_store_factory: Callable[[], MutableMapping[str, object]],
+    now_factory: Callable[[], float],
 ) -> CheckResult:
-    if (command_timeout_counter := disk.by_id(188)) is not None:
-        rate = get_rate(value_store, "cmd_timeout", now, command_timeout_counter.raw.value)
+    if (command_timeout_counter := attrs.get(188)) is not None:
+        rate = get_rate(
+            value_store_factory(),
+            "cmd_timeout",
+            now_factory(),
+            command_timeout_counter.raw.value,
+        )
         if rate >= MAX_COMMAND_TIMEOUTS_PER_HOUR / (60 * 60):
             yield Result(
                 state=State.CRIT,
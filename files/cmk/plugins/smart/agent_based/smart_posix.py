@@ -58,13 +58,11 @@ class ATAAll(BaseModel, frozen=True):
     ata_smart_attributes: ATATable | None = None
     temperature: Temperature | None = None
 
-    def by_id(self, id_: int) -> ATATableEntry | None:
+    def attributes_by_id(self) -> Mapping[int, ATATableEntry]:
         if self.ata_smart_attributes is None:
-            return None
-        for entry in self.ata_smart_attributes.table:
-            if entry.id == id_:
-                return entry
-        return None
+            return {}
+        # reversed, so that the first entry wins for repeated ids
+        return {entry.id: entry for entry in reversed(self.ata_smart_attributes.table)}
 
 
 class NVMeHealth(BaseModel, frozen=True):
@@ -248,6 +248,7 @@ def _parameter_valuespec_smart_ata() -> Dictionary:
             "id_196",
             "id_197",
             "id_199",
+            "discovered",
         ),
     )
 